@@ -1,24 +1,78 @@
-from flask import Flask, render_template, request, redirect, url_for
+from time import perf_counter
+_import_started = perf_counter()
+
+from flask import Flask, render_template, request, redirect, url_for, Response, stream_with_context
+from werkzeug.utils import secure_filename
 import os
 from io import BytesIO
 from pathlib import Path
 from parsers.doc_parser import parse_document
-from search import search_documents
+from search import search_documents, iter_search_results
 from stats import get_statistics
 from classify import MultiLevelClassifier
 from datetime import datetime
 import json
+import threading
 
 # Local storage setup
 UPLOAD_FOLDER = "uploads"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-classifier = MultiLevelClassifier()
-classifier.load_training_data()
-classifier.train()
+TRAINING_DATA_PATH = "training_data.json"
+
+# Set PROFILE_STARTUP=1 to print import and first-use timings
+PROFILE_STARTUP = os.environ.get("PROFILE_STARTUP") == "1"
+
+def log_startup(step, started):
+    if PROFILE_STARTUP:
+        print(f"[STARTUP] {step}: {(perf_counter() - started) * 1000:.1f} ms")
+
+# The classifier is loaded on first use, from the cached model when it is
+# up to date, so booting the app does not import sklearn or train anything.
+_classifier = None
+_classifier_lock = threading.Lock()
+
+def train_classifier():
+    classifier = MultiLevelClassifier()
+    classifier.load_training_data(TRAINING_DATA_PATH)
+    classifier.train()
+    # The cached model is best-effort; the app still works without a writable MODEL_DIR
+    try:
+        classifier.save_model(app.config['MODEL_DIR'])
+    except Exception as e:
+        print(f"[WARN] Could not save model to '{app.config['MODEL_DIR']}': {e}")
+    return classifier
+
+def get_classifier():
+    global _classifier
+    if _classifier is not None:
+        return _classifier
+
+    with _classifier_lock:
+        if _classifier is None:
+            started = perf_counter()
+            classifier = MultiLevelClassifier()
+            if not classifier.load_model(app.config['MODEL_DIR'], TRAINING_DATA_PATH):
+                classifier = train_classifier()
+            _classifier = classifier
+            log_startup("classifier load", started)
+    return _classifier
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+# The cached model is loaded with joblib, so it lives in the instance folder
+# (or MODEL_DIR), never anywhere uploads can be written
+app.config['MODEL_DIR'] = os.environ.get("MODEL_DIR", app.instance_path)
+
+_first_response_logged = False
+
+@app.after_request
+def log_first_response(response):
+    global _first_response_logged
+    if PROFILE_STARTUP and not _first_response_logged:
+        _first_response_logged = True
+        log_startup(f"first response ({request.path})", _import_started)
+    return response
 
 @app.context_processor
 def inject_now():
@@ -50,31 +104,20 @@ def save_file_locally(file, filename):
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
     file.save(filepath)
 
-def load_logged_documents(sort_by='title', sort_order='asc'):
-    documents = []
+def read_log_entries():
+    entries = []
     if not os.path.exists("classified_log.json"):
-        return documents
+        return entries
 
     with open("classified_log.json", encoding='utf-8') as f:
         for line in f:
             try:
-                log = json.loads(line.strip())
-                documents.append({
-                    "filename": log.get("filename", "unknown"),
-                    "title": log.get("title", "unknown"),
-                    "metadata": log.get("metadata", {
-                        "created": datetime.now().isoformat(),
-                        "modified": datetime.now().isoformat(),
-                        "size": 0
-                    }),
-                    "filetype": os.path.splitext(log.get("filename", "unknown"))[1][1:].upper(),
-                    "content": log.get("text", ""),
-                    "classification": log.get("predicted_label", "Unclassified")
-                })
+                entries.append(json.loads(line.strip()))
             except json.JSONDecodeError:
                 continue
+    return entries
 
-    # Sorting logic
+def sort_documents(documents, sort_by='title', sort_order='asc'):
     reverse_order = sort_order == 'desc'
     if sort_by == 'title':
         documents.sort(key=lambda x: x['title'].lower(), reverse=reverse_order)
@@ -85,9 +128,39 @@ def load_logged_documents(sort_by='title', sort_order='asc'):
     elif sort_by == 'created':
         documents.sort(key=lambda x: x['metadata'].get('created', ''), reverse=reverse_order)
     elif sort_by == 'classification':
-        documents.sort(key=lambda x: x['classification'].lower(), reverse=reverse_order)
-
+        documents.sort(key=lambda x: (x['classification'] or '').lower(), reverse=reverse_order)
     return documents
+
+def load_logged_documents(sort_by='title', sort_order='asc'):
+    # Listing rows are kept slim: the full text is only loaded on /details
+    documents = []
+    for log in read_log_entries():
+        documents.append({
+            "filename": log.get("filename", "unknown"),
+            "title": log.get("title", "unknown"),
+            "metadata": log.get("metadata", {
+                "created": datetime.now().isoformat(),
+                "modified": datetime.now().isoformat(),
+                "size": 0
+            }),
+            "filetype": os.path.splitext(log.get("filename", "unknown"))[1][1:].upper(),
+            "snippet": log.get("text", "")[:300].strip(),
+            "classification": log.get("predicted_label", "Unclassified")
+        })
+
+    return sort_documents(documents, sort_by=sort_by, sort_order=sort_order)
+
+def stream_json_array(records):
+    # Emit one record per chunk so large result sets are never built in memory
+    yield '['
+    first = True
+    for record in records:
+        if not first:
+            yield ','
+        yield json.dumps(record, ensure_ascii=False)
+        first = False
+    yield ']'
+
 @app.route('/download/<filename>')
 def download_file(filename):
     file_content = download_file_from_local(filename)
@@ -101,12 +174,12 @@ def index():
     if request.method == "POST":
         files = request.files.getlist("documents")
         for file in files:
-            if file.filename == '':
+            filename = secure_filename(file.filename)
+            if filename == '':
                 continue
                 
             # Save file to local storage
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
-            save_file_locally(file, file.filename)
+            save_file_locally(file, filename)
 
             # Process and classify the document
             file.seek(0)  # Rewind the file pointer
@@ -114,11 +187,11 @@ def index():
             file_obj = BytesIO(file_bytes)
             
             try:
-                result = parse_document(file_obj, filename=file.filename)
-                classification = classifier.classify(result["snippet"])
+                result = parse_document(file_obj, filename=filename)
+                classification = get_classifier().classify(result["snippet"])
 
                 log_entry = {
-                    "filename": file.filename,
+                    "filename": filename,
                     "title": result["title"],
                     "text": result["content"][:500],  # keep this light
                     "predicted_label": classification,
@@ -132,7 +205,7 @@ def index():
                 with open("classified_log.json", "a", encoding='utf-8') as log_file:
                     log_file.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
             except Exception as e:
-                print(f"Error processing file {file.filename}: {e}")
+                print(f"Error processing file {filename}: {e}")
 
         return redirect(url_for("index"))
 
@@ -160,18 +233,7 @@ def search():
     results = search_documents(keyword, app.config['UPLOAD_FOLDER'])
     stats = get_statistics(results['results'])
     
-    # Sort the results
-    reverse_order = sort_order == 'desc'
-    if sort_by == 'title':
-        results['results'].sort(key=lambda x: x['title'].lower(), reverse=reverse_order)
-    elif sort_by == 'filename':
-        results['results'].sort(key=lambda x: x['filename'].lower(), reverse=reverse_order)
-    elif sort_by == 'size':
-        results['results'].sort(key=lambda x: x['metadata'].get('size', 0), reverse=reverse_order)
-    elif sort_by == 'created':
-        results['results'].sort(key=lambda x: x['metadata'].get('created', ''), reverse=reverse_order)
-    elif sort_by == 'classification':
-        results['results'].sort(key=lambda x: x['classification'].lower(), reverse=reverse_order)
+    sort_documents(results['results'], sort_by=sort_by, sort_order=sort_order)
     
     return render_template("index.html", 
                          documents=results['results'],
@@ -180,10 +242,32 @@ def search():
                          stats=stats,
                          sort_by=sort_by,
                          sort_order=sort_order)
+@app.route("/api/documents")
+def api_documents():
+    sort_by = request.args.get('sort_by', 'title')
+    sort_order = request.args.get('sort_order', 'asc')
+    documents = load_logged_documents(sort_by=sort_by, sort_order=sort_order)
+    return Response(stream_json_array(documents), mimetype='application/json')
+
+@app.route("/api/search")
+def api_search():
+    keyword = request.args.get("keyword", "").strip()
+    if not keyword:
+        return {"error": "Missing 'keyword' parameter"}, 400
+
+    # Results are streamed in the order they are found, unsorted
+    results = iter_search_results(keyword, app.config['UPLOAD_FOLDER'])
+    return Response(stream_with_context(stream_json_array(results)),
+                    mimetype='application/json')
+
 @app.route("/retrain", methods=["POST"])
 def retrain():
-    classifier.load_training_data()
-    classifier.train()
+    global _classifier
+    # Train a fresh instance and swap it in, so concurrent classify() calls
+    # never see a half-refitted model
+    classifier = train_classifier()
+    with _classifier_lock:
+        _classifier = classifier
     return redirect(url_for("index"))
 
 @app.route("/details/<filename>")
@@ -200,7 +284,7 @@ def document_details(filename):
         'filename': filename,
         'metadata': metadata,
         'filetype': os.path.splitext(filename)[1][1:].upper(),
-        'classification': classifier.classify(doc['content'])
+        'classification': get_classifier().classify(doc['content'])
     })
 
     return render_template("details.html", document=doc)
@@ -242,7 +326,9 @@ def delete_document(filename):
     return redirect("/")  # or wherever you want
 @app.route("/update/<filename>", methods=["GET", "POST"])
 def update_document(filename):
-    filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
+    filename = secure_filename(filename)
+    if filename == '':
+        return "Invalid filename", 400
 
     if request.method == "POST":
         new_file = request.files.get("new_file")
@@ -259,10 +345,10 @@ def update_document(filename):
             file_obj = BytesIO(file_bytes)
 
             result = parse_document(file_obj, filename=filename)
-            classification = classifier.classify(result["snippet"])
+            classification = get_classifier().classify(result["snippet"])
 
             # Load all previous entries
-            documents = load_logged_documents()
+            documents = read_log_entries()
 
             # Update or insert the new entry
             updated_log = []
@@ -308,6 +394,8 @@ def update_document(filename):
 
     return render_template("update.html", filename=filename)
 
+log_startup("app import", _import_started)
+
 if __name__ == "__main__":
     import os
     port = int(os.environ.get("PORT", 5000))
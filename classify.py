@@ -1,9 +1,20 @@
+import hashlib
 import json
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
+import os
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 class MultiLevelClassifier:
     def __init__(self):
+        # sklearn is imported here so that importing this module stays cheap
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.naive_bayes import MultinomialNB
+
         self.vectorizer = TfidfVectorizer()
         self.clf1 = MultinomialNB()
         self.clf2 = MultinomialNB()
@@ -41,6 +52,67 @@ class MultiLevelClassifier:
         self.clf3.fit(X, labels3)
         self.is_trained = True
 
+    @staticmethod
+    def model_path(model_dir):
+        # The scikit-learn version is part of the name, so an artifact built by
+        # another version is never opened
+        import sklearn
+        return os.path.join(model_dir, f"classifier_model-{sklearn.__version__}.joblib")
+
+    def save_model(self, model_dir):
+        import joblib
+        path = self.model_path(model_dir)
+        os.makedirs(model_dir, exist_ok=True)
+
+        # Write to a temp file and rename, so readers never see a partial model
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        try:
+            joblib.dump({
+                "vectorizer": self.vectorizer,
+                "clf1": self.clf1,
+                "clf2": self.clf2,
+                "clf3": self.clf3,
+            }, tmp_path)
+            digest = _file_sha256(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with open(path + ".sha256", 'w', encoding='utf-8') as f:
+            f.write(digest)
+
+    def load_model(self, model_dir, training_path='training_data.json'):
+        path = self.model_path(model_dir)
+        digest_path = path + ".sha256"
+        if not os.path.exists(path) or not os.path.exists(digest_path):
+            return False
+        # The cached model is only used if it is newer than the training data
+        if os.path.exists(training_path) and os.path.getmtime(training_path) > os.path.getmtime(path):
+            return False
+
+        try:
+            # Check the artifact against the digest written by save_model
+            # before anything is unpickled
+            with open(digest_path, encoding='utf-8') as f:
+                expected = f.read().strip()
+            if _file_sha256(path) != expected:
+                print(f"[WARN] Cached model at '{path}' does not match its digest")
+                return False
+
+            import joblib
+            model = joblib.load(path)
+            self.vectorizer = model["vectorizer"]
+            self.clf1 = model["clf1"]
+            self.clf2 = model["clf2"]
+            self.clf3 = model["clf3"]
+        except Exception as e:
+            print(f"[WARN] Could not load cached model from '{path}': {e}")
+            return False
+
+        self.is_trained = True
+        return True
 
     def classify(self, text, as_dict=False):
         if not self.is_trained:
@@ -1,8 +1,8 @@
-from PyPDF2 import PdfReader
-import docx
 import os
 from io import BytesIO
-import magic  # You'll need to install python-magic (pip install python-magic)
+
+# Format backends (PyPDF2, python-docx, python-magic) are imported on first
+# use of their format so that importing this module stays cheap.
 
 def get_file_type(file_obj, filename=None):
     # First try to determine from filename
@@ -13,6 +13,7 @@ def get_file_type(file_obj, filename=None):
     
     # Then try magic to detect from content
     try:
+        import magic  # You'll need to install python-magic (pip install python-magic)
         file_obj.seek(0)
         header = file_obj.read(1024)
         file_obj.seek(0)
@@ -40,6 +41,7 @@ def parse_document(file_obj, filename=None):
         
         if file_type == '.pdf':
             try:
+                from PyPDF2 import PdfReader
                 reader = PdfReader(file_obj)
                 title = reader.metadata.title if reader.metadata else None
                 for page in reader.pages:
@@ -51,6 +53,7 @@ def parse_document(file_obj, filename=None):
                 
         elif file_type == '.docx':
             try:
+                import docx
                 doc = docx.Document(file_obj)
                 props = doc.core_properties
                 title = props.title if props else None
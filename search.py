@@ -3,11 +3,10 @@ from pathlib import Path
 from datetime import datetime
 from io import BytesIO
 from parsers.doc_parser import parse_document
-import fitz  # pip install PyMuPDF
-from docx import Document
-from docx.shared import RGBColor
 from time import time
+
 def highlight_docx(input_path, output_path, keyword):
+    from docx import Document
     doc = Document(input_path)
     for para in doc.paragraphs:
         if keyword.lower() in para.text.lower():
@@ -18,6 +17,7 @@ def highlight_docx(input_path, output_path, keyword):
 
 def highlight_pdf(input_path, keyword):
     try:
+        import fitz  # pip install PyMuPDF
         doc = fitz.open(input_path)
         keyword_lower = keyword.lower()
 
@@ -44,70 +44,93 @@ def highlight_pdf(input_path, keyword):
         return False
 
 
-def search_documents(keyword, upload_folder="uploads"):
-    results = []
+def match_document(file_path, keyword, highlight=False):
+    """Return a slim result record if file_path contains keyword, else None.
+
+    The raw bytes and extracted text stay local to this call, so nothing but
+    the snippet and metadata outlives it.
+    """
     keyword_lower = keyword.lower()
-    start_time = time()
 
+    with open(file_path, 'rb') as f:
+        file_obj = BytesIO(f.read())
+    result = parse_document(file_obj, filename=file_path.name)
+    
+    content = result.get("content", "")
+    content_lower = content.lower()
+
+    if keyword_lower not in content_lower:
+        return None
+
+    index = content_lower.find(keyword_lower)
+
+    # Extract snippet with padding
+    start = max(index - 200, 0)
+    end = min(index + len(keyword) + 200, len(content))
+    snippet = content[start:end]
+
+    # Highlight the keyword
+    original_keyword = content[index:index+len(keyword)]
+    snippet = snippet.replace(
+        original_keyword,
+        f"<mark>{original_keyword}</mark>"
+    )
+
+    # Get file metadata
+    stat = file_path.stat()
+    metadata = {
+        "created": datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m-%d %H:%M'),
+        "modified": datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M'),
+        "size": stat.st_size
+    }
+
+    # Highlighting writes into the stored upload, so only do it when asked
+    if highlight:
+        if file_path.suffix.lower() == ".pdf":
+            highlight_pdf(file_path, keyword)
+        elif file_path.suffix.lower() == ".docx":
+            highlight_docx(file_path, file_path, keyword)
+
+    # Full text is fetched on /details, not kept in results
+    return {
+        "filename": file_path.name,
+        "title": result['title'],
+        "classification": None,  # You can add classification if needed
+        "snippet": snippet,
+        "metadata": metadata,
+        "filetype": file_path.suffix[1:].upper() if file_path.suffix else "UNKNOWN"
+    }
+
+
+def iter_search_results(keyword, upload_folder="uploads", highlight=False):
+    """Yield a slim result record for each file in upload_folder containing keyword.
+
+    Each file is parsed by match_document, so only the small record is held
+    while the generator is paused. Pass highlight=True to also mark the
+    keyword in the stored PDF/DOCX files.
+    """
     # Ensure the upload folder exists
     if not os.path.exists(upload_folder):
-        return results
+        return
 
     # Search through all files in the upload folder
     for file_path in Path(upload_folder).rglob('*'):
         if file_path.is_file():
             try:
-                with open(file_path, 'rb') as f:
-                    file_content = f.read()
-                    file_obj = BytesIO(file_content)
-                    result = parse_document(file_obj, filename=file_path.name)
-                    
-                    content = result.get("content", "")
-                    content_lower = content.lower()
-
-                    if keyword_lower in content_lower:
-                        index = content_lower.find(keyword_lower)
-
-                        # Extract snippet with padding
-                        start = max(index - 200, 0)
-                        end = min(index + len(keyword) + 200, len(content))
-                        snippet = content[start:end]
-
-                        # Highlight the keyword
-                        original_keyword = content[index:index+len(keyword)]
-                        snippet = snippet.replace(
-                            original_keyword,
-                            f"<mark>{original_keyword}</mark>"
-                        )
-
-                        # Get file metadata
-                        stat = file_path.stat()
-                        metadata = {
-                            "created": datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m-%d %H:%M'),
-                            "modified": datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M'),
-                            "size": stat.st_size
-                        }
-
-                        results.append({
-                            "filename": file_path.name,
-                            "content": content,
-                            "title": result['title'],
-                            "classification": None,  # You can add classification if needed
-                            "snippet": snippet,
-                            "metadata": metadata,
-                            "filetype": file_path.suffix[1:].upper() if file_path.suffix else "UNKNOWN"
-                        })
-                        if file_path.suffix.lower() == ".pdf":
-                            highlight_pdf(file_path, keyword)
-                        elif file_path.suffix.lower() == ".docx":
-                            highlight_docx(file_path, file_path, keyword)
-
-
+                record = match_document(file_path, keyword, highlight=highlight)
             except Exception as e:
                 print(f"Error processing file {file_path}: {e}")
                 continue
+
+            if record is not None:
+                yield record
+
+
+def search_documents(keyword, upload_folder="uploads"):
+    start_time = time()
+    results = list(iter_search_results(keyword, upload_folder, highlight=True))
     search_duration = round(time() - start_time, 2)
     return {
         "results": results,
         "search_time": search_duration
-    }
\ No newline at end of file
+    }
@@ -52,9 +52,7 @@ def get_statistics(log_file_or_documents='classified_log.json'):
     for e in entries:
         # Handle both document formats (from file or from memory)
         if isinstance(e, dict):
-            if 'text' in e:
-                file_sizes.append(e["metadata"].get("size",0))
-            elif 'content' in e:
+            if 'metadata' in e:
                 file_sizes.append(e["metadata"].get("size",0))
             
             timestamp = None